@@ -1,9 +1,19 @@
 import boto3
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+import gzip
 import io
+import json
 import statsapi
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from numba import njit
+from datetime import datetime, timedelta
 from decimal import Decimal
+from retrosheet_dates import parse_retrosheet_dates
 
 TEAM_ABBREV_MAP = {
     "Arizona Diamondbacks": "ARI",
@@ -39,10 +49,30 @@ TEAM_ABBREV_MAP = {
 }
 
 S3_BUCKET = 'mlb-game-log-data-retrosheet'
-ELO_S3_KEY = 'elo_ratings_by_game.csv'
+ELO_S3_KEY = 'elo_ratings_by_game.parquet'
+LEGACY_ELO_S3_KEY = 'elo_ratings_by_game.csv'
+SCHEDULE_CACHE_KEY = 'cache/schedule_2025.csv.gz'
+LEGACY_SCHEDULE_CACHE_KEY = 'cache/schedule_2025.csv'
+GAMELOGS_S3_KEY = 'gamelogs/gl1871_2024.parquet'  # built by gamelogs_to_parquet.py
+DAILY_SUMMARY_PREFIX = 'logs/elo_daily_summary'  # hive-partitioned by date
 DYNAMODB_TABLE = 'Elo-Ratings-Table'
 
+# statsapi lookups are independent network calls, so they run on a thread pool
+STATSAPI_MAX_WORKERS = 32
+STATSAPI_TIMEOUT = 10
+
+# Lookup results persisted between runs
+PITCHER_ERA_CACHE_KEY = 'cache/pitcher_era.json'
+PITCHER_ERA_CACHE_TTL = timedelta(hours=24)
+INJURY_CACHE_KEY = 'cache/injury_penalty_{date}.json'
+
+# Ratings after the last historical (pre-2025) game; bump the key version to
+# force a full replay from 1871
+ELO_CHECKPOINT_KEY = 'state/elo_checkpoint_v1.json'
+CHECKPOINT_DATE = '2024-12-31'
+
 s3 = boto3.client('s3')
+s3_fs = pafs.S3FileSystem()
 dynamodb = boto3.resource('dynamodb')
 table = dynamodb.Table(DYNAMODB_TABLE)
 
@@ -50,9 +80,12 @@ table = dynamodb.Table(DYNAMODB_TABLE)
 base_k = 20
 home_field_advantage = 35
 
+@njit
 def expected_score(r1, r2):
-    return 1 / (1 + 10 ** ((r2 - r1) / 400))
+    return 1.0 / (1.0 + 10.0 ** ((r2 - r1) / 400.0))
 
+# IL counts only change daily, so look each team up at most once per run
+@lru_cache(maxsize=64)
 def get_injury_penalty(team_abbr):
     try:
         full_team_name = [k for k, v in TEAM_ABBREV_MAP.items() if v == team_abbr]
@@ -60,9 +93,9 @@ def get_injury_penalty(team_abbr):
             print(f"Could not resolve full team name for abbreviation: {team_abbr}")
             return 0
         team_id = statsapi.lookup_team(full_team_name[0])[0]['id']
-        roster = statsapi.get('team_roster', {'teamId': team_id, 'rosterType': 'injured'})
+        roster = statsapi.get('team_roster', {'teamId': team_id, 'rosterType': 'injured'},
+                              request_kwargs={'timeout': STATSAPI_TIMEOUT})
         if isinstance(roster, str):
-            import json
             roster = json.loads(roster)
         if 'roster' in roster and isinstance(roster['roster'], list):
             injured_players = roster['roster']
@@ -73,322 +106,403 @@ def get_injury_penalty(team_abbr):
         print(f"Team: {team_abbr}, Injured List Count: {il_count}")
         return -10 if il_count > 3 else 0
     except Exception as e:
+        # None marks a failed lookup so it isn't persisted to the S3 cache
         print(f"Error retrieving injury list for team {team_abbr}: {e}")
-        return 0
+        return None
 
-def update_elo(r1, r2, score_diff):
+@njit
+def update_elo(r1, r2, score_diff, k_base):
     mov_multiplier = (abs(score_diff) + 1) ** 0.8 / (7.5 + 0.006 * abs(r1 - r2))
-    k = base_k * mov_multiplier
+    k = k_base * mov_multiplier
     exp = expected_score(r1, r2)
     return r1 + k * (1 - exp), r2 - k * (1 - exp)
 
+@njit
+def run_elo(home_idx, away_idx, hs, vs, home_bonus, away_bonus, ratings, hfa, k_base):
+    # Sequential Elo pass over every game; ratings is updated in place and the
+    # post-game (adjusted) ratings for each side are returned as arrays.
+    n = home_idx.shape[0]
+    home_post = np.empty(n)
+    away_post = np.empty(n)
+    for i in range(n):
+        h = home_idx[i]
+        a = away_idx[i]
+        r_h = ratings[h] + home_bonus[i] + hfa
+        r_a = ratings[a] + away_bonus[i]
+        d = hs[i] - vs[i]
+        if d > 0:
+            r_h, r_a = update_elo(r_h, r_a, d, k_base)
+        elif d < 0:
+            r_a, r_h = update_elo(r_a, r_h, -d, k_base)
+        ratings[h] = r_h - hfa
+        ratings[a] = r_a
+        home_post[i] = ratings[h]
+        away_post[i] = ratings[a]
+    return home_post, away_post
+
 def load_gamelogs_from_s3():
-    obj = s3.get_object(Bucket='mlb-game-log-data-retrosheet', Key='gamelogs/gl1871_2024.zip')
-    zip_bytes = io.BytesIO(obj['Body'].read())
-    import zipfile
-    with zipfile.ZipFile(zip_bytes, 'r') as z:
-        all_files = [f for f in z.namelist() if f.endswith('.txt')]
-        dfs = [pd.read_csv(z.open(f), header=None) for f in all_files]
-    df = pd.concat(dfs, ignore_index=True)
-    df = df[[0, 3, 6, 9, 10]]
-    df.columns = ['date', 'away_team', 'home_team', 'away_score', 'home_score']
-    return df
+    # Pre-projected Parquet copy of the Retrosheet logs; buffer_size turns on
+    # buffered column-chunk reads (8 MiB at a time) instead of many small reads
+    gamelogs = pq.read_table(
+        f'{S3_BUCKET}/{GAMELOGS_S3_KEY}',
+        columns=['date', 'away_team', 'home_team', 'away_score', 'home_score'],
+        filesystem=s3_fs,
+        buffer_size=8 * 1024 * 1024
+    )
+    return gamelogs.to_pandas()
 
-def load_all_games():
-    historical_df = load_gamelogs_from_s3()
-    historical_df['date'] = pd.to_datetime(historical_df['date'], format='%Y%m%d')
-    historical_df = historical_df[['date', 'home_team', 'away_team', 'home_score', 'away_score']]
+def put_gzipped_csv(key, frame):
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=6) as gz:
+        frame.to_csv(gz, index=False)
+    s3.put_object(Bucket=S3_BUCKET, Key=key, Body=buf.getvalue(),
+                  ContentEncoding='gzip', ContentType='text/csv')
 
-    current_year = datetime.now(tz=pd.Timestamp.utcnow().tz).year
+def load_cached_schedule():
     try:
-        cached_obj = s3.get_object(Bucket=S3_BUCKET, Key='cache/schedule_2025.csv')
-        df_2025 = pd.read_csv(io.BytesIO(cached_obj['Body'].read()))
+        cached_obj = s3.get_object(Bucket=S3_BUCKET, Key=SCHEDULE_CACHE_KEY)
+        return pd.read_csv(io.BytesIO(cached_obj['Body'].read()), compression='gzip')
+    except s3.exceptions.NoSuchKey:
+        pass
+    # Fall back to the uncompressed cache written before the switch to gzip,
+    # and carry it forward under the new key
+    try:
+        cached_obj = s3.get_object(Bucket=S3_BUCKET, Key=LEGACY_SCHEDULE_CACHE_KEY)
+    except s3.exceptions.NoSuchKey:
+        return None
+    df_2025 = pd.read_csv(io.BytesIO(cached_obj['Body'].read()))
+    put_gzipped_csv(SCHEDULE_CACHE_KEY, df_2025)
+    return df_2025
+
+def load_season_games():
+    # The cache key, season filters and DynamoDB writes all assume 2025
+    current_year = 2025
+    df_2025 = load_cached_schedule()
+    if df_2025 is not None:
         df_2025['date'] = pd.to_datetime(df_2025['date'], errors='coerce')
         print(f"Loaded cached schedule with {len(df_2025)} games.")
-    except s3.exceptions.NoSuchKey:
-        all_games = []
-        seen_games = set()
-        from datetime import timedelta
+    else:
+        # The schedule endpoint accepts the whole season range in one request
         start = datetime(current_year, 3, 1)  # MLB season typically starts in March
-        end = datetime.utcnow()
-        delta = timedelta(days=7)
-        week_counter = 0
-        total_fetched = 0
-        while start < end:
-            chunk_end = min(start + delta, end)
-            week_counter += 1
-            weekly_games = 0
-            games_chunk = statsapi.schedule(start_date=start.strftime('%Y-%m-%d'), end_date=chunk_end.strftime('%Y-%m-%d'))
-            for g in games_chunk:
-                if g['status'] == 'Final' and g.get('game_type') == 'R':
-                  home_name = g['home_name']
-                  away_name = g['away_name']
-                  home_abbr = TEAM_ABBREV_MAP.get(home_name)
-                  away_abbr = TEAM_ABBREV_MAP.get(away_name)
-                  game_key = (g['game_date'], home_abbr, away_abbr)
-                  if home_abbr and away_abbr and game_key not in seen_games:
-                      seen_games.add(game_key)
-                      weekly_games += 1
-                      all_games.append({
-                          'date': pd.to_datetime(g['game_date']),
-                          'home_team': home_abbr,
-                          'away_team': away_abbr,
-                          'home_score': g['home_score'],
-                          'away_score': g['away_score'],
-                          'pitchers': g.get('home_probable_pitcher', '') + ' vs ' + g.get('away_probable_pitcher', ''),
-                          'injury_note': g.get('note', '')
-                      })
-        df_2025 = pd.DataFrame(all_games)
-        print(f"Week {week_counter}: Retrieved {weekly_games} games from {start.strftime('%Y-%m-%d')} to {chunk_end.strftime('%Y-%m-%d')}")
-        total_fetched += weekly_games
-        start += delta
-        print(f"Fetched and cached {len(df_2025)} new games.")
-        print(f"Total regular season games fetched for 2025: {total_fetched}")
-        buf = io.BytesIO()
+        end = min(datetime.utcnow(), datetime(current_year, 12, 31))
+        games = statsapi.schedule(start_date=start.strftime('%Y-%m-%d'), end_date=end.strftime('%Y-%m-%d'))
+        all_games = []
+        for g in games:
+            if g['status'] == 'Final' and g.get('game_type') == 'R':
+                home_abbr = TEAM_ABBREV_MAP.get(g['home_name'])
+                away_abbr = TEAM_ABBREV_MAP.get(g['away_name'])
+                if home_abbr and away_abbr:
+                    all_games.append({
+                        'date': g['game_date'],
+                        'home_team': home_abbr,
+                        'away_team': away_abbr,
+                        'home_score': g['home_score'],
+                        'away_score': g['away_score'],
+                        'pitchers': g.get('home_probable_pitcher', '') + ' vs ' + g.get('away_probable_pitcher', ''),
+                        'injury_note': g.get('note', '')
+                    })
+        df_2025 = pd.DataFrame(all_games, columns=['date', 'home_team', 'away_team', 'home_score',
+                                                   'away_score', 'pitchers', 'injury_note'])
+        df_2025 = df_2025.drop_duplicates(['date', 'home_team', 'away_team'])
+        print(f"Fetched and cached {len(df_2025)} regular season games for {current_year}.")
         df_2025['date'] = pd.to_datetime(df_2025['date'], errors='coerce')
         df_2025 = df_2025.sort_values(by='date')
-        df_2025.to_csv(buf, index=False)
-        buf.seek(0)
-        s3.put_object(Bucket=S3_BUCKET, Key='cache/schedule_2025.csv', Body=buf.getvalue())
+        put_gzipped_csv(SCHEDULE_CACHE_KEY, df_2025)
 
     df_2025 = df_2025[df_2025['home_team'].isin(TEAM_ABBREV_MAP.values()) & df_2025['away_team'].isin(TEAM_ABBREV_MAP.values())]
-    df_combined = pd.concat([historical_df, df_2025], ignore_index=True)
-    df_combined = df_combined.dropna(subset=['date', 'home_team', 'away_team'])
+    df_2025 = df_2025.dropna(subset=['date', 'home_team', 'away_team'])
 
     # Optional enhancement: Check for missing days in 2025 season
     all_dates = pd.date_range(start='2025-03-01', end=datetime.utcnow().date())
-    missing_dates = [d for d in all_dates if d not in df_combined[df_combined['date'].dt.year == 2025]['date'].dt.date.unique()]
+    missing_dates = [d for d in all_dates if d not in df_2025[df_2025['date'].dt.year == 2025]['date'].dt.date.unique()]
     if missing_dates:
         print(f"Warning: Missing dates in 2025 schedule cache: {missing_dates}")
 
-    return df_combined.sort_values(by='date')
+    return df_2025.sort_values(by='date')
 
-# Cache dictionary for pitcher ERA lookups
-pitcher_era_cache = {}
+def load_all_games():
+    historical_df = load_gamelogs_from_s3()
+    historical_df['date'] = parse_retrosheet_dates(historical_df['date'])
+    historical_df = historical_df[['date', 'home_team', 'away_team', 'home_score', 'away_score']]
+    historical_df = historical_df.dropna(subset=['date', 'home_team', 'away_team'])
 
-def calculate_elo():
+    df_combined = pd.concat([historical_df, load_season_games()], ignore_index=True)
+    return df_combined.sort_values(by='date')
 
-    df = load_all_games()
-    ratings = {team: 1500 for team in TEAM_ABBREV_MAP.values()}
-    updated_rows = []
-
-    for _, game in df.iterrows():
-        if pd.isnull(game['date']):
-            print(f"Skipping game with missing date: {game}")
-            continue
-        try:
-            game_date = pd.to_datetime(game['date'], errors='raise')
-        except Exception as e:
-            print(f"Invalid date encountered: {game['date']} in game: {game}, error: {e}")
-            continue
-        year = game_date.year
-        apply_adjustments = year == 2025
-        home = game['home_team']
-        away = game['away_team']
-        hs = game['home_score']
-        vs = game['away_score']
-        if pd.isnull(game['date']):
-            print(f"Skipping game with missing or invalid date: {game}")
-            continue
-        date = game_date.strftime('%Y-%m-%d')
+def load_json_from_s3(key):
+    try:
+        obj = s3.get_object(Bucket=S3_BUCKET, Key=key)
+    except s3.exceptions.NoSuchKey:
+        return None
+    return json.loads(obj['Body'].read())
 
-        # Adjust Elo based on pitcher info and injury note
-        home_pitcher = away_pitcher = ''
-        if apply_adjustments:
-            pitchers = game.get('pitchers', '')
-            home_pitcher = pitchers.split(' vs ')[0].strip() if ' vs ' in pitchers else ''
-            away_pitcher = pitchers.split(' vs ')[1].strip() if ' vs ' in pitchers else ''
-
-        # Fetch pitcher ERA-based Elo adjustments
-        def get_pitcher_era_adjustment(name):
-            if name in pitcher_era_cache:
-                return pitcher_era_cache[name]
-            try:
-                search = statsapi.lookup_player(name.title())
-                if search:
-                    pid = search[0]['id']
-                    stats = statsapi.player_stat_data(pid, group='pitching', type='season')
-                    era = float(stats['stats'][0]['stats'].get('era', 4.5))
-                    print(f"Pitcher: {name.title()}, ERA: {era}")
-                    if era <= 3.0:
-                        adj = 15
-                    elif era <= 4.0:
-                        adj = 5
-                    elif era >= 5.0:
-                        adj = -10
-                    else:
-                        adj = 0
-                    pitcher_era_cache[name] = adj
-                    return adj
-                pitcher_era_cache[name] = 0
-                return 0
-            except Exception as e:
-                print(f"Error retrieving ERA for pitcher {name}: {e}")
-                pitcher_era_cache[name] = 0
-                return 0
-            except Exception as e:
-                print(f"Error retrieving ERA for pitcher {name}: {e}")
-                return 0
-            except:
-                return 0
-
-        home_pitcher_adj = get_pitcher_era_adjustment(home_pitcher) if apply_adjustments else 0
-        away_pitcher_adj = get_pitcher_era_adjustment(away_pitcher) if apply_adjustments else 0
+def save_json_to_s3(key, payload):
+    s3.put_object(Bucket=S3_BUCKET, Key=key, Body=json.dumps(payload).encode())
 
-        # Injury adjustment using team IL count
-        injury_note = str(game.get('injury_note', '')).lower()
-        home_injury_adj = get_injury_penalty(home) if apply_adjustments else 0
-        away_injury_adj = get_injury_penalty(away) - 10 if apply_adjustments and away.lower() in injury_note else (get_injury_penalty(away) if apply_adjustments else 0)
+def load_previous_ratings():
+    try:
+        return pq.read_table(f'{S3_BUCKET}/{ELO_S3_KEY}', filesystem=s3_fs).to_pandas()
+    except FileNotFoundError:
+        pass
+    # Fall back to the CSV written before the switch to Parquet
+    try:
+        obj = s3.get_object(Bucket=S3_BUCKET, Key=LEGACY_ELO_S3_KEY)
+    except s3.exceptions.NoSuchKey:
+        return pd.DataFrame(columns=['date'])
+    return pd.read_csv(io.BytesIO(obj['Body'].read()))
 
-        home_elo = ratings.get(home, 1500) + home_pitcher_adj + home_injury_adj
-        away_elo = ratings.get(away, 1500) + away_pitcher_adj + away_injury_adj
+# Cache dictionary for pitcher ERA lookups
+pitcher_era_cache = {}
 
-        home_adj = home_elo + home_field_advantage
-        away_adj = away_elo
+# Fetch pitcher ERA-based Elo adjustments
+def get_pitcher_era_adjustment(name):
+    if name in pitcher_era_cache:
+        return pitcher_era_cache[name]
+    try:
+        search = statsapi.lookup_player(name.title())
+        if search:
+            pid = search[0]['id']
+            stats = statsapi.player_stat_data(pid, group='pitching', type='season')
+            era = float(stats['stats'][0]['stats'].get('era', 4.5))
+            print(f"Pitcher: {name.title()}, ERA: {era}")
+            if era <= 3.0:
+                adj = 15
+            elif era <= 4.0:
+                adj = 5
+            elif era >= 5.0:
+                adj = -10
+            else:
+                adj = 0
+            pitcher_era_cache[name] = adj
+            return adj
+        pitcher_era_cache[name] = 0
+        return 0
+    except Exception as e:
+        # None marks a failed lookup; it is neither cached nor persisted
+        print(f"Error retrieving ERA for pitcher {name}: {e}")
+        return None
 
-        if hs > vs:
-            home_new, away_new = update_elo(home_adj, away_adj, hs - vs)
-            home_elo = home_new - home_field_advantage
-            away_elo = away_new
-        elif vs > hs:
-            away_new, home_new = update_elo(away_adj, home_adj, vs - hs)
-            home_elo = home_new - home_field_advantage
-            away_elo = away_new
+def calculate_elo():
+    # Start from an empty in-memory cache so a warm container only reuses
+    # lookups through the S3 cache, which enforces the TTL
+    pitcher_era_cache.clear()
+    get_injury_penalty.cache_clear()
+
+    # Historical ratings never change, so start from the saved checkpoint when
+    # there is one and only replay this season's games
+    checkpoint = load_json_from_s3(ELO_CHECKPOINT_KEY)
+    resumed = bool(checkpoint and checkpoint['last_date'] >= CHECKPOINT_DATE)
+    if resumed:
+        print(f"Resuming from Elo checkpoint as of {checkpoint['last_date']}.")
+        df = load_season_games()
+        start_ratings = checkpoint['ratings']
+    else:
+        df = load_all_games()
+        start_ratings = {}
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df = df.dropna(subset=['date']).reset_index(drop=True)
+    n = len(df)
+
+    # Store teams as categoricals over every abbreviation (current and
+    # historical); the category codes double as indices into ratings
+    teams = list(TEAM_ABBREV_MAP.values())
+    teams += sorted(set(start_ratings).union(df['home_team'], df['away_team']) - set(teams))
+    team_dtype = pd.CategoricalDtype(teams)
+    df['home_team'] = df['home_team'].astype(team_dtype)
+    df['away_team'] = df['away_team'].astype(team_dtype)
+    ratings = np.array([start_ratings.get(team, 1500.0) for team in teams])
+
+    # Pitcher and injury adjustments only apply to 2025 games; they don't
+    # depend on the running ratings, so resolve them before the Elo pass
+    home_bonus = np.zeros(n)
+    away_bonus = np.zeros(n)
+    season_mask = df['date'].dt.year == 2025
+    season_df = df.loc[season_mask]
+    # partition always yields three string columns, even with no season games
+    pitchers = season_df['pitchers'].fillna('').astype(str).str.partition(' vs ')
+    has_both = pitchers[1] != ''
+    home_pitchers = pitchers[0].where(has_both, '').str.strip()
+    away_pitchers = pitchers[2].str.strip()
+    injury_notes = season_df['injury_note'].fillna('').astype(str).str.lower()
+    season_games = list(zip(season_df.index, season_df['home_team'], season_df['away_team'],
+                            home_pitchers, away_pitchers, injury_notes))
+    pitchers_to_fetch = set(home_pitchers).union(away_pitchers)
+    teams_to_fetch = set(season_df['home_team']).union(season_df['away_team'])
+
+    # Reuse pitcher ERAs from the last 24h and today's IL penalties if an
+    # earlier run already fetched them
+    now = datetime.utcnow()
+    era_state = load_json_from_s3(PITCHER_ERA_CACHE_KEY)
+    if era_state and now - datetime.fromisoformat(era_state['date']) < PITCHER_ERA_CACHE_TTL:
+        pitcher_era_cache.update(era_state['data'])
+        era_cached_at = era_state['date']
+    else:
+        era_cached_at = now.isoformat()
+    injury_key = INJURY_CACHE_KEY.format(date=now.strftime('%Y-%m-%d'))
+    il_map = load_json_from_s3(injury_key) or {}
+
+    pitchers_to_fetch = [p for p in pitchers_to_fetch if p not in pitcher_era_cache]
+    teams_to_fetch = [t for t in teams_to_fetch if t not in il_map]
+    with ThreadPoolExecutor(max_workers=STATSAPI_MAX_WORKERS) as executor:
+        era_results = dict(zip(pitchers_to_fetch, executor.map(get_pitcher_era_adjustment, pitchers_to_fetch)))
+        il_results = dict(zip(teams_to_fetch, executor.map(get_injury_penalty, teams_to_fetch)))
+
+    # Failed lookups (None) count as 0 for this run only and are retried next run
+    era_fetched = {name: adj for name, adj in era_results.items() if adj is not None}
+    il_fetched = {team: adj for team, adj in il_results.items() if adj is not None}
+    pitcher_era_cache.update(era_fetched)
+    il_map.update(il_fetched)
+
+    if era_fetched:
+        save_json_to_s3(PITCHER_ERA_CACHE_KEY, {'date': era_cached_at, 'data': pitcher_era_cache})
+    if il_fetched:
+        save_json_to_s3(injury_key, il_map)
+
+    for i, home, away, home_pitcher, away_pitcher, injury_note in season_games:
+        # Adjust Elo based on pitcher info and injury note
+        home_pitcher_adj = pitcher_era_cache.get(home_pitcher, 0)
+        away_pitcher_adj = pitcher_era_cache.get(away_pitcher, 0)
 
-        ratings[home] = home_elo
-        ratings[away] = away_elo
+        # Injury adjustment using team IL count
+        home_injury_adj = il_map.get(home, 0)
+        away_injury_adj = il_map.get(away, 0) - 10 if away.lower() in injury_note else il_map.get(away, 0)
+
+        home_bonus[i] = home_pitcher_adj + home_injury_adj
+        away_bonus[i] = away_pitcher_adj + away_injury_adj
+
+    home_idx = df['home_team'].cat.codes.to_numpy(dtype=np.int64)
+    away_idx = df['away_team'].cat.codes.to_numpy(dtype=np.int64)
+    hs = df['home_score'].to_numpy(dtype=np.float64)
+    vs = df['away_score'].to_numpy(dtype=np.float64)
+
+    # Run the historical games first so the ratings can be checkpointed at the
+    # season boundary, then carry on with the current season
+    hist_n = int((df['date'] <= CHECKPOINT_DATE).sum())
+    game_arrays = (home_idx, away_idx, hs, vs, home_bonus, away_bonus)
+    hist_home_post, hist_away_post = run_elo(*(a[:hist_n] for a in game_arrays),
+                                             ratings, float(home_field_advantage), float(base_k))
+    if hist_n:
+        save_json_to_s3(ELO_CHECKPOINT_KEY, {
+            'last_date': CHECKPOINT_DATE,
+            'ratings': dict(zip(teams, ratings.tolist()))
+        })
+    season_start_ratings = ratings.copy()
+    season_home_post, season_away_post = run_elo(*(a[hist_n:] for a in game_arrays),
+                                                 ratings, float(home_field_advantage), float(base_k))
+    home_post = np.concatenate([hist_home_post, season_home_post])
+    away_post = np.concatenate([hist_away_post, season_away_post])
+
+    home_teams = df['home_team'].array
+    away_teams = df['away_team'].array
+    result_columns = {
+        'date': df['date'].to_numpy(),
+        'home_team': home_teams,
+        'away_team': away_teams,
+        'home_score': df['home_score'].to_numpy(),
+        'away_score': df['away_score'].to_numpy(),
+        'home_elo_post_raw': (home_post - home_bonus).round(2),
+        'away_elo_post_raw': (away_post - away_bonus).round(2),
+        'home_elo_post': home_post.round(2),
+        'away_elo_post': away_post.round(2)
+    }
 
-        updated_rows.append({
+    items_2025 = []
+    season_idx = np.flatnonzero(season_mask.to_numpy())
+    season_dates = df['date'].iloc[season_idx].dt.strftime('%Y-%m-%d')
+    for i, date in zip(season_idx, season_dates):
+        home = home_teams[i]
+        away = away_teams[i]
+        home_elo = home_post[i]
+        away_elo = away_post[i]
+        raw_home = home_post[i]
+        raw_away = away_post[i]
+
+        items_2025.append({
+            'team_date': f"{home}#{date}",
+            'team': home,
+            'date': date,
+            'elo': Decimal(str(round(home_elo, 2))),
+            'elo_raw': Decimal(str(round(raw_home, 2)))
+        })
+        items_2025.append({
+            'team_date': f"{away}#{date}",
+            'team': away,
             'date': date,
-            'home_team': home,
-            'away_team': away,
-            'home_score': hs,
-            'away_score': vs,
-            'home_elo_post_raw': round(ratings[home] - home_pitcher_adj - home_injury_adj, 2),
-            'away_elo_post_raw': round(ratings[away] - away_pitcher_adj - away_injury_adj, 2),
-            'home_elo_post': round(home_elo, 2),
-            'away_elo_post': round(away_elo, 2)
+            'elo': Decimal(str(round(away_elo, 2))),
+            'elo_raw': Decimal(str(round(raw_away, 2)))
         })
 
-        if year == 2025:
-            raw_home = ratings.get(home, 1500)
-            raw_away = ratings.get(away, 1500)
-            
-            table.put_item(Item={
-                'team_date': f"{home}#{date}",
-                'team': home,
-                'date': date,
-                'elo': Decimal(str(round(home_elo, 2))),
-                'elo_raw': Decimal(str(round(raw_home, 2)))
-            })
-            table.put_item(Item={
-                'team_date': f"{away}#{date}",
-                'team': away,
-                'date': date,
-                'elo': Decimal(str(round(away_elo, 2))),
-                'elo_raw': Decimal(str(round(raw_away, 2)))
-            })
-
-    result_df = pd.DataFrame(updated_rows)
-    result_df = result_df[result_df['home_team'].isin(TEAM_ABBREV_MAP.values()) & result_df['away_team'].isin(TEAM_ABBREV_MAP.values())]
-
-    # ensure date column is datetime
-    result_df['date'] = pd.to_datetime(result_df['date'], errors='raise')
+    # batch_writer chunks into 25-item BatchWriteItem calls; overwrite_by_pkeys
+    # keeps only the last item per key (e.g. doubleheaders), as put_item did
+    with table.batch_writer(overwrite_by_pkeys=['team_date']) as batch:
+        for item in items_2025:
+            batch.put_item(Item=item)
 
-    # merge updated elo back into full dataset
-    try:
-        old_obj = s3.get_object(Bucket=S3_BUCKET, Key=ELO_S3_KEY)
-        df_all = pd.read_csv(io.BytesIO(old_obj['Body'].read()))
-        df_all['date'] = pd.to_datetime(df_all['date'], errors='coerce')
-        df_all = df_all.dropna(subset=['date'])
-        df_all = df_all[df_all['date'].dt.year != 2025]
-    except s3.exceptions.NoSuchKey:
-        df_all = pd.DataFrame()
+    # Rows are already in date (and processing) order with datetime64 dates
+    result_df = pd.DataFrame(result_columns)
 
-    result_df = pd.DataFrame(updated_rows)
-    result_df['date'] = pd.to_datetime(result_df['date'], errors='coerce')
-    result_df = result_df.sort_values(by='date')
-    buf = io.BytesIO()
-    result_df.to_csv(buf, index=False)
-    buf.seek(0)
-
-    timestamp = datetime.utcnow().strftime('%Y%m%d%H%M%S')
-    backup_key = f"backup/elo_ratings_by_game_{timestamp}.csv"
-    s3.copy_object(
-        Bucket=S3_BUCKET,
-        CopySource={"Bucket": S3_BUCKET, "Key": ELO_S3_KEY},
-        Key=backup_key
+    # merge updated elo back into full dataset
+    df_all = load_previous_ratings()
+    df_all['date'] = pd.to_datetime(df_all['date'], errors='coerce')
+    df_all = df_all.dropna(subset=['date'])
+    # Keep the stored rows this run didn't replay: everything through the
+    # checkpoint when resuming, otherwise anything before the first game
+    if resumed:
+        df_all = df_all[df_all['date'] <= CHECKPOINT_DATE]
+    elif n:
+        df_all = df_all[df_all['date'] < df['date'].min()]
+
+    # overwrite with updated Elo; earlier copies are kept by bucket versioning
+    # (see enable_s3_versioning.py)
+    final_df = pd.concat([df_all, result_df], ignore_index=True).sort_values(by='date')
+    pq.write_table(
+        pa.Table.from_pandas(final_df, preserve_index=False),
+        f'{S3_BUCKET}/{ELO_S3_KEY}',
+        filesystem=s3_fs,
+        compression='snappy',
+        use_dictionary=True
     )
 
-    # overwrite with updated Elo
-    final_df = pd.concat([df_all, result_df], ignore_index=True).sort_values(by='date')
-    final_buf = io.BytesIO()
-    final_df.to_csv(final_buf, index=False)
-    final_buf.seek(0)
-    s3.put_object(Bucket=S3_BUCKET, Key=ELO_S3_KEY, Body=final_buf.getvalue())
-
-    # Save Elo changes and log to S3 in CSV format
-    summary_rows = []
-    for team, final_elo in ratings.items():
-        initial_elo = 1500  # Default unless overwritten
-        for row in updated_rows:
-            if row['home_team'] == team:
-                initial_elo = row['home_elo_post']
-            elif row['away_team'] == team:
-                initial_elo = row['away_elo_post']
-        summary_rows.append({
-            'team': team,
-            'initial_elo': round(initial_elo, 2),
-            'final_elo': round(final_elo, 2),
-            'change': round(final_elo - initial_elo, 2),
-            'date': datetime.utcnow().strftime('%Y-%m-%d')
-        })
+    # Log raw vs adjusted Elo difference per team, one row per side of each game
+    diff_columns = ['date', 'team', 'elo_raw', 'elo_adjusted']
+    elo_diff_df = pd.concat([
+        result_df[['date', 'home_team', 'home_elo_post_raw', 'home_elo_post']].set_axis(diff_columns, axis=1),
+        result_df[['date', 'away_team', 'away_elo_post_raw', 'away_elo_post']].set_axis(diff_columns, axis=1)
+    ]).sort_index(kind='stable').reset_index(drop=True)
+    elo_diff_df['difference'] = (elo_diff_df['elo_adjusted'] - elo_diff_df['elo_raw']).round(2)
+
+    # Save Elo changes and log to S3 in CSV format; initial_elo is each team's
+    # rating entering the current season
+    initial_elo = pd.Series(season_start_ratings, index=teams)
+    final_elo = pd.Series(ratings, index=teams)
+    summary_df = pd.DataFrame({
+        'team': teams,
+        'initial_elo': initial_elo.round(2).to_numpy(),
+        'final_elo': final_elo.round(2).to_numpy(),
+        'change': (final_elo - initial_elo).round(2).to_numpy(),
+        'date': datetime.utcnow().strftime('%Y-%m-%d')
+    })
 
-    summary_df = pd.DataFrame(summary_rows)
-
-    # Log raw vs adjusted Elo difference per team
-    raw_adjusted_log = []
-    for row in updated_rows:
-        for side in ['home', 'away']:
-            raw = row[f'{side}_elo_post_raw']
-            adjusted = row[f'{side}_elo_post']
-            raw_adjusted_log.append({
-                'date': row['date'],
-                'team': row[f'{side}_team'],
-                'elo_raw': raw,
-                'elo_adjusted': adjusted,
-                'difference': round(adjusted - raw, 2)
-            })
-    elo_diff_df = pd.DataFrame(raw_adjusted_log)
     if not elo_diff_df.empty:
-        diff_buf = io.StringIO()
-        elo_diff_df.to_csv(diff_buf, index=False)
-        diff_buf.seek(0)
-        diff_key = f"logs/elo_adjustment_diff_{datetime.utcnow().strftime('%Y%m%d')}.csv"
-        s3.put_object(Bucket=S3_BUCKET, Key=diff_key, Body=diff_buf.getvalue())
+        diff_key = f"logs/elo_adjustment_diff_{datetime.utcnow().strftime('%Y%m%d')}.csv.gz"
+        put_gzipped_csv(diff_key, elo_diff_df)
     summary_df = summary_df[summary_df['team'].isin(TEAM_ABBREV_MAP.values())]
-    csv_buf = io.StringIO()
-    summary_df.to_csv(csv_buf, index=False)
-    csv_buf.seek(0)
-    log_key = f"logs/elo_summary_{datetime.utcnow().strftime('%Y%m%d')}.csv"
-    s3.put_object(Bucket=S3_BUCKET, Key=log_key, Body=csv_buf.getvalue())
-
-    # Append to centralized summary log
-    try:
-        central_obj = s3.get_object(Bucket=S3_BUCKET, Key='logs/elo_daily_summary.csv')
-        central_df = pd.read_csv(io.BytesIO(central_obj['Body'].read()))
-        combined_df = pd.concat([central_df, summary_df], ignore_index=True)
-    except s3.exceptions.NoSuchKey:
-        combined_df = summary_df
-
-    full_buf = io.StringIO()
-    combined_df.to_csv(full_buf, index=False)
-    full_buf.seek(0)
-    s3.put_object(Bucket=S3_BUCKET, Key='logs/elo_daily_summary.csv', Body=full_buf.getvalue())
+    log_key = f"logs/elo_summary_{datetime.utcnow().strftime('%Y%m%d')}.csv.gz"
+    put_gzipped_csv(log_key, summary_df)
+
+    # Add today's summary to the centralized log as its own date partition;
+    # read the full history with pq.read_table(..., partitioning='hive')
+    summary_date = datetime.utcnow().strftime('%Y-%m-%d')
+    pq.write_table(
+        pa.Table.from_pandas(summary_df.drop(columns='date'), preserve_index=False),
+        f'{S3_BUCKET}/{DAILY_SUMMARY_PREFIX}/date={summary_date}/part.parquet',
+        filesystem=s3_fs,
+        compression='snappy'
+    )
 
     return {
         "statusCode": 200,
-        "body": f"{len(updated_rows)} games reprocessed and Elo ratings updated. Summary saved to {log_key}."
+        "body": f"{n} games reprocessed and Elo ratings updated. Summary saved to {log_key}."
     }
 
 calculate_elo()
\ No newline at end of file
@@ -1,13 +1,18 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
+import numpy as np
 import pandas as pd
 import io
 import zipfile
+from numba import njit
+from retrosheet_dates import parse_retrosheet_dates
 
 # S3 settings
 bucket = "mlb-game-log-data-retrosheet"
 zip_key = "gamelogs/gl1871_2024.zip"
 
 s3 = boto3.client("s3")
+transfer_config = TransferConfig(multipart_chunksize=16 * 1024 * 1024)
 columns = [
     "date",
     "game_num",
@@ -22,17 +27,18 @@ columns = [
     "home_score",
 ]
 
+
 # Download ZIP from S3
-obj = s3.get_object(Bucket=bucket, Key=zip_key)
-with zipfile.ZipFile(io.BytesIO(obj["Body"].read())) as z:
+zip_buf = io.BytesIO()
+s3.download_fileobj(bucket, zip_key, zip_buf, Config=transfer_config)
+zip_buf.seek(0)
+with zipfile.ZipFile(zip_buf) as z:
     all_dfs = []
     for file_name in z.namelist():
         if file_name.lower().endswith(".txt"):
             with z.open(file_name) as f:
                 df = pd.read_csv(f, names=columns, usecols=range(len(columns)))
-                df["date"] = pd.to_datetime(
-                    df["date"], format="%Y%m%d", errors="coerce"
-                )
+                df["date"] = parse_retrosheet_dates(df["date"])
                 all_dfs.append(df)
 
 # Combine and clean
@@ -40,44 +46,65 @@ game_logs_df = pd.concat(all_dfs).dropna(subset=["date"])
 
 # Elo setup
 teams = pd.concat([game_logs_df["home_team"], game_logs_df["visiting_team"]]).unique()
-elo_ratings = {team: 1500 for team in teams}
+team_index = {team: i for i, team in enumerate(teams)}
+elo_ratings = np.full(len(teams), 1500.0)
 
 
+@njit
 def expected_score(r1, r2):
-    return 1 / (1 + 10 ** ((r2 - r1) / 400))
+    return 1.0 / (1.0 + 10.0 ** ((r2 - r1) / 400.0))
 
 
+@njit
 def update_elo(winner, loser, k=20):
     exp = expected_score(winner, loser)
     return winner + k * (1 - exp), loser - k * (1 - exp)
 
 
-elo_history = []
-for _, row in game_logs_df.sort_values("date").iterrows():
-    home, away = row["home_team"], row["visiting_team"]
-    hs, vs = row["home_score"], row["visiting_score"]
-    if home not in elo_ratings or away not in elo_ratings:
-        continue
-    if not (isinstance(hs, (int, float)) and isinstance(vs, (int, float))):
-        continue
-    home_elo, away_elo = elo_ratings[home], elo_ratings[away]
-    if hs > vs:
-        home_elo, away_elo = update_elo(home_elo, away_elo)
-    elif vs > hs:
-        away_elo, home_elo = update_elo(away_elo, home_elo)
-    elo_ratings[home], elo_ratings[away] = home_elo, away_elo
-    elo_history.append(
-        {
-            "date": row["date"],
-            "home_team": home,
-            "away_team": away,
-            "home_score": hs,
-            "away_score": vs,
-            "home_elo_post": home_elo,
-            "away_elo_post": away_elo,
-        }
-    )
+@njit
+def run_elo(home_idx, away_idx, hs, vs, ratings):
+    n = home_idx.shape[0]
+    home_post = np.empty(n)
+    away_post = np.empty(n)
+    for i in range(n):
+        h, a = home_idx[i], away_idx[i]
+        home_elo, away_elo = ratings[h], ratings[a]
+        if hs[i] > vs[i]:
+            home_elo, away_elo = update_elo(home_elo, away_elo)
+        elif vs[i] > hs[i]:
+            away_elo, home_elo = update_elo(away_elo, home_elo)
+        ratings[h], ratings[a] = home_elo, away_elo
+        home_post[i], away_post[i] = home_elo, away_elo
+    return home_post, away_post
+
+
+games = game_logs_df.sort_values("date")
+games = games.assign(
+    home_score=pd.to_numeric(games["home_score"], errors="coerce"),
+    visiting_score=pd.to_numeric(games["visiting_score"], errors="coerce"),
+).dropna(subset=["home_team", "visiting_team"])
+# Games with a missing score stay in the output; run_elo leaves their ratings unchanged
+home_idx = np.array([team_index[t] for t in games["home_team"]], dtype=np.int64)
+away_idx = np.array([team_index[t] for t in games["visiting_team"]], dtype=np.int64)
+home_post, away_post = run_elo(
+    home_idx,
+    away_idx,
+    games["home_score"].to_numpy(dtype=np.float64),
+    games["visiting_score"].to_numpy(dtype=np.float64),
+    elo_ratings,
+)
+elo_history = pd.DataFrame(
+    {
+        "date": games["date"].to_numpy(),
+        "home_team": games["home_team"].to_numpy(),
+        "away_team": games["visiting_team"].to_numpy(),
+        "home_score": games["home_score"].to_numpy(),
+        "away_score": games["visiting_score"].to_numpy(),
+        "home_elo_post": home_post,
+        "away_elo_post": away_post,
+    }
+)
 
 # Save to CSV
-pd.DataFrame(elo_history).to_csv("elo_ratings_by_game.csv", index=False)
+elo_history.to_csv("elo_ratings_by_game.csv", index=False)
 print("Elo ratings saved to elo_ratings_by_game.csv")
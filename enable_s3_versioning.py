@@ -0,0 +1,38 @@
+import boto3
+
+# One-off setup: keep prior versions of every object in the bucket so the
+# daily Elo job can overwrite elo_ratings_by_game.parquet without taking its
+# own backup copy first. Each run rewrites the ratings, caches and logs, so
+# old versions expire after a week (keeping the last few) rather than piling
+# up forever. Note this replaces any existing lifecycle configuration.
+
+bucket = "mlb-game-log-data-retrosheet"
+noncurrent_days = 7
+noncurrent_versions_kept = 3
+
+s3 = boto3.client("s3")
+s3.put_bucket_versioning(
+    Bucket=bucket, VersioningConfiguration={"Status": "Enabled"}
+)
+s3.put_bucket_lifecycle_configuration(
+    Bucket=bucket,
+    LifecycleConfiguration={
+        "Rules": [
+            {
+                "ID": "expire-noncurrent-versions",
+                "Filter": {},
+                "Status": "Enabled",
+                "NoncurrentVersionExpiration": {
+                    "NoncurrentDays": noncurrent_days,
+                    "NewerNoncurrentVersions": noncurrent_versions_kept,
+                },
+                "Expiration": {"ExpiredObjectDeleteMarker": True},
+                "AbortIncompleteMultipartUpload": {"DaysAfterInitiation": 1},
+            }
+        ]
+    },
+)
+status = s3.get_bucket_versioning(Bucket=bucket).get("Status")
+print("Versioning on s3://{}: {}".format(bucket, status))
+print("Noncurrent versions expire after {} days (newest {} kept)".format(
+    noncurrent_days, noncurrent_versions_kept))
@@ -0,0 +1,64 @@
+import boto3
+from boto3.s3.transfer import TransferConfig
+import io
+import zipfile
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+# One-off conversion of the Retrosheet gamelog ZIP into the single Parquet
+# file read by calculate_advanced_elo_aws.py
+
+# AWS S3 settings
+bucket = "mlb-game-log-data-retrosheet"
+zip_key = "gamelogs/gl1871_2024.zip"
+parquet_key = "gamelogs/gl1871_2024.parquet"
+
+s3 = boto3.client("s3")
+transfer_config = TransferConfig(multipart_chunksize=16 * 1024 * 1024)
+
+# Only date, teams and scores are kept (Retrosheet fields 0, 3, 6, 9, 10)
+columns = ["date", "away_team", "home_team", "away_score", "home_score"]
+read_options = pacsv.ReadOptions(autogenerate_column_names=True, use_threads=True)
+convert_options = pacsv.ConvertOptions(
+    include_columns=["f0", "f3", "f6", "f9", "f10"],
+    column_types={
+        "f0": pa.int32(),
+        "f3": pa.string(),
+        "f6": pa.string(),
+        "f9": pa.int32(),
+        "f10": pa.int32(),
+    },
+)
+
+print("Fetching {} from S3...".format(zip_key))
+zip_buf = io.BytesIO()
+s3.download_fileobj(bucket, zip_key, zip_buf, Config=transfer_config)
+zip_buf.seek(0)
+with zipfile.ZipFile(zip_buf) as z:
+    tables = []
+    for file_name in z.namelist():
+        if file_name.lower().endswith(".txt"):
+            print("Processing file:", file_name)
+            tables.append(
+                pacsv.read_csv(
+                    pa.BufferReader(z.read(file_name)),
+                    read_options=read_options,
+                    convert_options=convert_options,
+                )
+            )
+
+table = pa.concat_tables(tables).rename_columns(columns)
+for name in ["away_team", "home_team"]:
+    i = table.schema.get_field_index(name)
+    table = table.set_column(i, name, table.column(name).dictionary_encode())
+
+buf = io.BytesIO()
+pq.write_table(table, buf, compression="snappy")
+buf.seek(0)
+s3.upload_fileobj(buf, bucket, parquet_key, Config=transfer_config)
+print(
+    "Wrote {} games from {} file(s) to s3://{}/{}".format(
+        table.num_rows, len(tables), bucket, parquet_key
+    )
+)
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+
+def parse_retrosheet_dates(values):
+    # Build datetime64 values from Retrosheet YYYYMMDD integers; missing or
+    # impossible dates (e.g. 20240230) become NaT instead of rolling over
+    d = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+    valid = np.isfinite(d)
+    d = np.where(valid, d, 19700101).astype(np.int64)
+    month, day = (d // 100) % 100, d % 100
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+    d = np.where(valid, d, 19700101)
+    months = (d // 10000 - 1970).astype("datetime64[Y]") + (
+        (d // 100) % 100 - 1
+    ).astype("timedelta64[M]")
+    dates = months + (d % 100 - 1).astype("timedelta64[D]")
+    valid &= dates.astype("datetime64[M]") == months  # day rolled into next month
+    dates = dates.astype("datetime64[ns]")
+    dates[~valid] = np.datetime64("NaT")
+    return dates
@@ -1,15 +1,21 @@
 # -*- coding: utf-8 -*-
-import os
+import posixpath
+import re
 import requests
 import boto3
-from bs4 import BeautifulSoup
+import urllib3
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+from boto3.exceptions import S3UploadFailedError
 from botocore.exceptions import NoCredentialsError, ClientError
 
 # S3 bucket settings
 s3_bucket = "mlb-game-log-data-retrosheet"
 s3_prefix = "raw/"
-local_dir = "retrosheet_gamelogs"
-os.makedirs(local_dir, exist_ok=True)
+max_workers = 16
+
+# Game log links on the (static) Retrosheet index page, e.g. gl2024.zip
+LINK_RE = re.compile(r'href\s*=\s*["\'](?P<u>[^"\']*gl[^"\']*\.(?:txt|zip))["\']', re.I)
 
 # Set up S3 client
 try:
@@ -33,18 +39,7 @@ except requests.RequestException as e:
     print("Failed to connect to Retrosheet: {}".format(e))
     exit()
 
-soup = BeautifulSoup(resp.text, "html.parser")
-
-links = []
-for a_tag in soup.find_all("a"):
-    href = a_tag.get("href")
-    if (
-        href
-        and "gl" in href.lower()
-        and (href.endswith(".txt") or href.endswith(".zip"))
-    ):
-        links.append(href)
-
+links = LINK_RE.findall(resp.text)
 
 if not links:
     print("No game log files found on Retrosheet.")
@@ -52,30 +47,32 @@ if not links:
 
 print("Found {} game log files.".format(len(links)))
 
-# Download and upload files
-for filename in links:
-    file_url = filename
-    local_path = os.path.join(local_dir, file_url)
-    s3_key = "{}{}".format(s3_prefix, filename)
 
-    print("\nDownloading: {}".format(filename))
+def fetch_and_upload(filename):
+    # Stream the file straight from Retrosheet into S3 without touching disk
+    file_url = urljoin(base_url, filename)
+    s3_key = "{}{}".format(s3_prefix, posixpath.basename(filename))
     try:
-        r = requests.get(file_url, stream=True, timeout=20)
+        r = requests.get(file_url, stream=True, timeout=30)
         r.raise_for_status()
-
-        os.makedirs(os.path.dirname(local_path), exist_ok=True)
-        
-        with open(local_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
-        print("Saved to {}".format(local_path))
     except requests.RequestException as e:
-        print("Download failed: {}".format(e))
-        continue
+        return "Download failed for {}: {}".format(file_url, e)
 
-    print("Uploading to s3://{}/{}".format(s3_bucket, s3_key))
     try:
-        s3.upload_file(local_path, s3_bucket, s3_key)
-        print("Upload successful.")
-    except ClientError as e:
-        print("Upload failed: {}".format(e))
+        r.raw.decode_content = True
+        s3.upload_fileobj(r.raw, s3_bucket, s3_key)
+    except urllib3.exceptions.HTTPError as e:
+        # The body is read from the raw stream, so mid-download failures
+        # surface here as urllib3 errors rather than RequestException
+        return "Download failed for {}: {}".format(file_url, e)
+    except (ClientError, S3UploadFailedError) as e:
+        return "Upload failed for {}: {}".format(s3_key, e)
+    finally:
+        r.close()
+    return "Uploaded {} to s3://{}/{}".format(file_url, s3_bucket, s3_key)
+
+
+# Download and upload files concurrently
+with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    for i, message in enumerate(executor.map(fetch_and_upload, links), 1):
+        print("[{}/{}] {}".format(i, len(links), message))
@@ -1,7 +1,9 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
 import pandas as pd
 import io
 import zipfile
+from retrosheet_dates import parse_retrosheet_dates
 
 # AWS S3 settings
 bucket = "mlb-game-log-data-retrosheet"
@@ -9,6 +11,7 @@ zip_key = "gamelogs/gl1871_2024.zip"  # full path in S3
 
 # Set up S3 client
 s3 = boto3.client("s3")
+transfer_config = TransferConfig(multipart_chunksize=16 * 1024 * 1024)  # 16 MiB parts
 
 # Retrosheet game log columns (first 11 are usually enough for Elo models)
 columns = [
@@ -25,17 +28,20 @@ columns = [
     "home_score",
 ]
 
+
 # Download and extract ZIP file from S3
 print("Fetching {} from S3...".format(zip_key))
-obj = s3.get_object(Bucket=bucket, Key=zip_key)
-with zipfile.ZipFile(io.BytesIO(obj["Body"].read())) as z:
+zip_buf = io.BytesIO()
+s3.download_fileobj(bucket, zip_key, zip_buf, Config=transfer_config)
+zip_buf.seek(0)
+with zipfile.ZipFile(zip_buf) as z:
     all_dfs = []
     for file_name in z.namelist():
         if file_name.lower().endswith(".txt"):
             print("Processing file:", file_name)
             with z.open(file_name) as f:
                 df = pd.read_csv(f, names=columns, usecols=range(len(columns)))
-                df["date"] = pd.to_datetime(df["date"], format="%Y%m%d")
+                df["date"] = parse_retrosheet_dates(df["date"])
                 df["source_file"] = file_name
                 all_dfs.append(df)
 